@@ -11,23 +11,32 @@ from __future__ import annotations
 
 __version__ = "0.9.1"
 
+import atexit
 import os
+import socket
 import sys
+import threading
+import time
 import tomllib
-from datetime import datetime, time as dt_time, timedelta, timezone
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, time as dt_time, timedelta, timezone, tzinfo
 from pathlib import Path
-from typing import TYPE_CHECKING
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
 from zoneinfo import ZoneInfo
 
 import requests
 import streamlit as st
 from dotenv import load_dotenv
-from influxdb_client import InfluxDBClient, Point, WritePrecision
-from influxdb_client.client.write_api import SYNCHRONOUS
+from influxdb_client import InfluxDBClient, WriteOptions, WritePrecision
+from requests.adapters import HTTPAdapter
 from timezonefinder import TimezoneFinder
+from urllib3.connection import HTTPConnection
+from urllib3.util import Retry
 
 if TYPE_CHECKING:
-    from influxdb_client import InfluxDBClient as InfluxDBClientType
+    from influxdb_client import DeleteApi, QueryApi, WriteApi
 
 # Load environment variables from .env file if present
 load_dotenv()
@@ -38,11 +47,56 @@ INFLUX_TOKEN = os.getenv("INFLUX_TOKEN", "")
 INFLUX_ORG = os.getenv("INFLUX_ORG", "openplotter")
 INFLUX_BUCKET = os.getenv("INFLUX_BUCKET", "default")
 
+# Seconds UPDATE waits for the background writer to confirm a save. This is
+# shorter than the worst-case retry schedule (4 attempts of up to 10s each plus
+# backoff), so running out means "still pending", not "failed".
+WRITE_CONFIRM_TIMEOUT = 15.0
+
 # Signal K Configuration (for automatic timezone from GPS)
 SIGNALK_URL = os.getenv("SIGNALK_URL", "http://localhost:3000")
 
-# Timezone finder instance (reused for performance)
-_tz_finder = TimezoneFinder()
+# Signal K request timeout in seconds (connect, read)
+SIGNALK_TIMEOUT = (0.5, 1.0)
+
+# Seconds between background timezone lookups
+TIMEZONE_REFRESH_SECONDS = 600
+
+# Maximum number of memoized history timestamp labels
+DATETIME_LABEL_CACHE_SIZE = 1024
+
+
+@st.cache_resource(show_spinner=False)
+def _get_tz_finder() -> TimezoneFinder:
+    """
+    Return the shared timezone finder.
+
+    Built lazily on the first lookup and kept for the life of the process.
+    Polygon data is read from the package's data files per lookup rather than
+    held in memory (~2 MB instead of ~33 MB); lookups run on the background
+    refresh thread every few minutes, so the extra ~0.1 ms doesn't matter.
+    TimezoneFinderL is smaller still but is not used: it maps many islands
+    (e.g. Bermuda) to a fixed-offset ocean zone with the wrong DST rules.
+    """
+    return TimezoneFinder(in_memory=False)
+
+
+@st.cache_resource(show_spinner=False)
+def get_signalk_session() -> requests.Session:
+    """
+    Return the shared HTTP session for Signal K requests.
+
+    Keeps the connection to Signal K alive between position lookups instead of
+    handshaking on every request. A failed lookup is retried once after a
+    short backoff, so a momentary hiccup doesn't leave the fallback timezone
+    in place until the next refresh.
+    """
+    session = requests.Session()
+    session.headers.update({"Accept": "application/json"})
+    retry = Retry(total=1, backoff_factor=0.1, status_forcelist=(502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
 
 def get_boat_position() -> tuple[float, float] | None:
@@ -53,9 +107,9 @@ def get_boat_position() -> tuple[float, float] | None:
         Tuple of (latitude, longitude) or None if unavailable.
     """
     try:
-        response = requests.get(
+        response = get_signalk_session().get(
             f"{SIGNALK_URL}/signalk/v1/api/vessels/self/navigation/position",
-            timeout=2,
+            timeout=SIGNALK_TIMEOUT,
         )
         if response.status_code == 200:
             data = response.json()
@@ -68,41 +122,84 @@ def get_boat_position() -> tuple[float, float] | None:
     return None
 
 
-def get_boat_timezone() -> ZoneInfo | timezone:
+def lookup_boat_timezone() -> ZoneInfo | None:
     """
-    Get the timezone for the boat's current position.
+    Resolve the timezone for the boat's current GPS position.
 
-    Fetches GPS position from Signal K and converts to timezone.
-    Falls back to system local timezone if position unavailable.
+    Blocks on the Signal K request; use get_boat_timezone() from the UI.
 
     Returns:
-        Timezone object for the boat's timezone.
+        Timezone for the current position, or None if unavailable.
     """
-    # Check cache in session state (refresh every 10 minutes)
-    cache_key = "tz_cache"
-    cache_time_key = "tz_cache_time"
-    now = datetime.now(timezone.utc)
-
-    if cache_key in st.session_state and cache_time_key in st.session_state:
-        cache_age = (now - st.session_state[cache_time_key]).total_seconds()
-        if cache_age < 600:  # 10 minutes
-            return st.session_state[cache_key]
-
-    # Fetch position and lookup timezone
     position = get_boat_position()
     if position:
-        tz_name = _tz_finder.timezone_at(lat=position[0], lng=position[1])
+        tz_name = _get_tz_finder().timezone_at(lat=position[0], lng=position[1])
         if tz_name:
-            tz = ZoneInfo(tz_name)
-            st.session_state[cache_key] = tz
-            st.session_state[cache_time_key] = now
-            return tz
+            return ZoneInfo(tz_name)
+    return None
+
+
+class TimezoneRefresher:
+    """
+    Keep the boat timezone fresh without blocking script runs.
+
+    Lookups run on a daemon thread; callers always get the last known value
+    immediately and a refresh is started once it is older than
+    TIMEZONE_REFRESH_SECONDS.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tz: ZoneInfo | None = None
+        self._fetched_at: float | None = None
+        self._refreshing = False
+
+    def get(self) -> ZoneInfo | None:
+        """Return the last resolved timezone, starting a refresh if it is stale."""
+        with self._lock:
+            stale = (
+                self._fetched_at is None
+                or time.monotonic() - self._fetched_at >= TIMEZONE_REFRESH_SECONDS
+            )
+            if stale and not self._refreshing:
+                self._refreshing = True
+                threading.Thread(target=self._refresh, daemon=True).start()
+            return self._tz
+
+    def _refresh(self) -> None:
+        tz = None
+        try:
+            tz = lookup_boat_timezone()
+        finally:
+            with self._lock:
+                self._tz = tz
+                self._fetched_at = time.monotonic()
+                self._refreshing = False
+
+
+@st.cache_resource(show_spinner=False)
+def get_timezone_refresher() -> TimezoneRefresher:
+    """Return the shared background timezone refresher."""
+    return TimezoneRefresher()
+
+
+def get_boat_timezone() -> ZoneInfo | timezone:
+    """
+    Get the timezone for the boat's current position.
+
+    Uses the timezone resolved in the background from the Signal K GPS position
+    (refreshed every 10 minutes). Falls back to system local timezone if the
+    position is unavailable or the first lookup hasn't finished yet.
+
+    Returns:
+        Timezone object for the boat's timezone.
+    """
+    tz = get_timezone_refresher().get()
+    if tz is not None:
+        return tz
 
     # Fall back to system local timezone
-    local_tz = datetime.now().astimezone().tzinfo
-    st.session_state[cache_key] = local_tz
-    st.session_state[cache_time_key] = now
-    return local_tz
+    return datetime.now().astimezone().tzinfo
 
 
 def format_local_time(dt: datetime, tz: ZoneInfo) -> str:
@@ -120,10 +217,19 @@ def format_local_time(dt: datetime, tz: ZoneInfo) -> str:
     return local_dt.strftime("%H:%M")
 
 
+@st.cache_resource(show_spinner=False)
+def _datetime_label_cache() -> dict[tuple[datetime, tzinfo], str]:
+    """Return the process-wide memo of formatted entry timestamps."""
+    return {}
+
+
 def format_local_datetime(dt: datetime, tz: ZoneInfo) -> str:
     """
     Format a datetime with date in the given timezone.
 
+    History timestamps never change once read, so results are memoized per
+    (datetime, timezone) across reruns and sessions.
+
     Args:
         dt: Datetime to format (should be timezone-aware).
         tz: Target timezone.
@@ -131,19 +237,49 @@ def format_local_datetime(dt: datetime, tz: ZoneInfo) -> str:
     Returns:
         Formatted string like "01/15 14:32 CDT".
     """
-    local_dt = dt.astimezone(tz)
-    tz_abbrev = local_dt.strftime("%Z")
-    return local_dt.strftime(f"%m/%d %H:%M {tz_abbrev}")
+    cache = _datetime_label_cache()
+    key = (dt, tz)
+    label = cache.get(key)
+    if label is None:
+        label = dt.astimezone(tz).strftime("%m/%d %H:%M %Z")
+        if len(cache) >= DATETIME_LABEL_CACHE_SIZE:
+            cache.clear()
+        cache[key] = label
+    return label
 
 
 # Boat configuration from TOML file
-def load_boat_config() -> dict:
+class _SailLabels(dict):
+    """Sail display names; sails without a configured name are shown as-is."""
+
+    def __missing__(self, sail: str) -> str:
+        return sail
+
+
+@dataclass(frozen=True)
+class BoatConfig:
+    """Boat-specific settings loaded from boat_config.toml."""
+
+    name: str
+    main_states: tuple[str, ...]
+    headsails: tuple[str, ...]
+    downwind_sails: tuple[str, ...]
+    # Read-only; lookups fall back to the sail name itself, including for sails
+    # in stored history that are no longer in the config
+    display: Mapping[str, str]
+
+
+@st.cache_resource(show_spinner=False)
+def load_boat_config() -> BoatConfig:
     """
     Load boat-specific configuration from TOML file.
 
     Looks for boat_config.toml in the same directory as the app.
     Falls back to boat_config.toml.example if not found.
     Exits with error if neither file exists.
+
+    Cached as a resource so the file is read and parsed once per process
+    rather than on every script rerun.
     """
     app_dir = Path(__file__).parent
     config_path = app_dir / "boat_config.toml"
@@ -151,71 +287,354 @@ def load_boat_config() -> dict:
 
     if config_path.exists():
         with open(config_path, "rb") as f:
-            return tomllib.load(f)
+            data = tomllib.load(f)
     elif example_path.exists():
         with open(example_path, "rb") as f:
-            return tomllib.load(f)
+            data = tomllib.load(f)
     else:
-        sys.exit("Error: boat_config.toml not found. Copy boat_config.toml.example to boat_config.toml and customize.")
+        sys.exit(
+            "Error: boat_config.toml not found. Copy boat_config.toml.example to boat_config.toml and customize."
+        )
+
+    sails = data.get("sails", {})
+    return BoatConfig(
+        name=data.get("boat", {}).get("name", "Boat"),
+        main_states=tuple(sails.get("main", {}).get("options", [])),
+        headsails=tuple(sails.get("headsail", {}).get("options", [])),
+        downwind_sails=tuple(sails.get("downwind", {}).get("options", [])),
+        display=MappingProxyType(_SailLabels(data.get("display", {}))),
+    )
 
 
 _boat_config = load_boat_config()
 
 # Sail definitions (loaded from boat_config.toml)
-BOAT_NAME = _boat_config.get("boat", {}).get("name", "Boat")
-MAIN_STATES = _boat_config.get("sails", {}).get("main", {}).get("options", [])
-HEADSAILS = _boat_config.get("sails", {}).get("headsail", {}).get("options", [])
-DOWNWIND_SAILS = _boat_config.get("sails", {}).get("downwind", {}).get("options", [])
+BOAT_NAME = _boat_config.name
+MAIN_STATES = _boat_config.main_states
+HEADSAILS = _boat_config.headsails
+DOWNWIND_SAILS = _boat_config.downwind_sails
 
 # Display names for sails (short versions for buttons)
-SAIL_DISPLAY = _boat_config.get("display", {})
+SAIL_DISPLAY = _boat_config.display
+
+# Pill labels per section (option -> display name), resolved once per script run
+MAIN_LABELS = {opt: SAIL_DISPLAY[opt] for opt in MAIN_STATES}
+HEADSAIL_LABELS = {sail: SAIL_DISPLAY[sail] for sail in HEADSAILS}
+DOWNWIND_LABELS = {sail: SAIL_DISPLAY[sail] for sail in DOWNWIND_SAILS}
+
+
+# HTTP timeout for InfluxDB requests (milliseconds), so a stalled link fails a
+# query or write instead of hanging the page
+INFLUX_TIMEOUT_MS = 10_000
+
+# Idle time before TCP keepalive probes start on pooled InfluxDB connections
+INFLUX_KEEPALIVE_IDLE_SECONDS = 30
+
+_INFLUX_SOCKET_OPTIONS = [
+    *HTTPConnection.default_socket_options,
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+# Linux calls the idle option TCP_KEEPIDLE, macOS TCP_KEEPALIVE
+_TCP_KEEPIDLE = getattr(socket, "TCP_KEEPIDLE", getattr(socket, "TCP_KEEPALIVE", None))
+if _TCP_KEEPIDLE is not None:
+    _INFLUX_SOCKET_OPTIONS.append(
+        (socket.IPPROTO_TCP, _TCP_KEEPIDLE, INFLUX_KEEPALIVE_IDLE_SECONDS)
+    )
 
 
+@st.cache_resource(show_spinner=False)
 def get_influx_client() -> InfluxDBClient:
-    """Create and return a configured InfluxDB client instance."""
-    return InfluxDBClient(url=INFLUX_URL, token=INFLUX_TOKEN, org=INFLUX_ORG)
+    """
+    Return the shared InfluxDB client instance.
+
+    Cached as a resource so the underlying HTTP connection pool is reused
+    across reruns and sessions instead of reconnecting on every call.
+    Gzip is enabled for query responses and line-protocol writes, and pooled
+    connections use TCP keepalive so routers on the boat network don't drop
+    them while the app sits idle between interactions. The client is only
+    closed on interpreter exit (after the write API registered later flushes).
+    """
+    client = InfluxDBClient(
+        url=INFLUX_URL,
+        token=INFLUX_TOKEN,
+        org=INFLUX_ORG,
+        enable_gzip=True,
+        timeout=INFLUX_TIMEOUT_MS,
+    )
+    # Connection pools are created lazily per host, so this applies to all of them
+    pool_manager = client.api_client.rest_client.pool_manager
+    pool_manager.connection_pool_kw["socket_options"] = _INFLUX_SOCKET_OPTIONS
+    atexit.register(client.close)
+    return client
+
+
+@st.cache_resource(show_spinner=False)
+def get_query_api() -> QueryApi:
+    """Return the shared query API bound to the cached client."""
+    return get_influx_client().query_api()
+
+
+class PendingWrite:
+    """Delivery status of one point handed to the batching write API."""
 
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.error: str | None = None
 
-@st.cache_data(ttl=30)
-def get_current_sail_config() -> dict[str, str | bool]:
+    def wait(self, timeout: float = WRITE_CONFIRM_TIMEOUT) -> bool:
+        """
+        Wait for InfluxDB to acknowledge or reject the point.
+
+        Args:
+            timeout: Maximum number of seconds to wait.
+
+        Returns:
+            True once the write has finished (check ``error``), False if it is
+            still pending (being retried) when the timeout runs out.
+        """
+        return self.done.wait(timeout)
+
+
+class WriteTracker:
     """
-    Fetch the most recent sail configuration from InfluxDB.
-    Cached for 30 seconds to reduce database queries.
+    Track points handed to the batching write API until InfluxDB acknowledges them.
 
-    Returns:
-        Dictionary containing main, headsail, downwind, staysail_mode, and comment.
-        Returns default values if no configuration found or on error.
+    The client's own ``WriteApi.flush()`` is a no-op, so success/error callbacks
+    resolve each point's PendingWrite. Points are matched by their line-protocol
+    body, so sessions sharing the write API only ever wait on their own writes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: dict[bytes, list[PendingWrite]] = {}
+
+    def track(self, record: str) -> PendingWrite:
+        """Register a point before it is queued; call discard() if queueing fails."""
+        pending = PendingWrite()
+        with self._lock:
+            self._pending.setdefault(record.encode("utf-8"), []).append(pending)
+        return pending
+
+    def discard(self, record: str, pending: PendingWrite) -> None:
+        """Forget a point that never made it onto the write queue."""
+        key = record.encode("utf-8")
+        with self._lock:
+            waiters = self._pending.get(key, [])
+            if pending in waiters:
+                waiters.remove(pending)
+            if not waiters:
+                self._pending.pop(key, None)
+
+    def _resolve(self, data: bytes, error: str | None) -> None:
+        # A batch body is newline-joined records, but a multi-line comment keeps
+        # its raw newline inside the quoted field, so look for each tracked
+        # record as a whole rather than splitting the body into lines
+        body = b"\n" + data + b"\n"
+        with self._lock:
+            keys = [key for key in self._pending if b"\n" + key + b"\n" in body]
+            waiters = [pending for key in keys for pending in self._pending.pop(key)]
+        for pending in waiters:
+            pending.error = error
+            pending.done.set()
+
+    def on_success(self, conf: tuple, data: bytes) -> None:
+        """Batching write API callback for an acknowledged batch."""
+        self._resolve(data, None)
+
+    def on_error(self, conf: tuple, data: bytes, exception: Exception) -> None:
+        """Batching write API callback for a batch that failed after retries."""
+        self._resolve(data, str(exception))
+
+
+@st.cache_resource(show_spinner=False)
+def get_write_tracker() -> WriteTracker:
+    """Return the shared tracker for points queued on the batching write API."""
+    return WriteTracker()
+
+
+@st.cache_resource(show_spinner=False)
+def get_write_api() -> WriteApi:
     """
-    client = get_influx_client()
-    query_api = client.query_api()
+    Return the shared batching write API bound to the cached client.
 
-    query = f'''
+    Points are sent from the client's background writer (with retries) and
+    flushed on interpreter exit.
+    """
+    tracker = get_write_tracker()
+    write_api = get_influx_client().write_api(
+        write_options=WriteOptions(
+            batch_size=1,
+            flush_interval=1_000,
+            jitter_interval=0,
+            retry_interval=1_000,
+            max_retries=3,
+        ),
+        success_callback=tracker.on_success,
+        error_callback=tracker.on_error,
+    )
+    atexit.register(write_api.close)
+    return write_api
+
+
+@st.cache_resource(show_spinner=False)
+def get_delete_api() -> DeleteApi:
+    """Return the shared delete API bound to the cached client."""
+    return get_influx_client().delete_api()
+
+
+DEFAULT_SAIL_CONFIG: dict[str, str | bool] = {
+    "main": "DOWN",
+    "headsail": "",
+    "downwind": "",
+    "staysail_mode": False,
+    "comment": "",
+}
+
+# Number of entries shown in the sidebar history
+HISTORY_LIMIT = 50
+
+# Backstop expiry for cached reads, so entries written or deleted outside the
+# app (Grafana, influx CLI) still show up; app writes clear the cache directly
+SAIL_CACHE_TTL_SECONDS = 30
+
+# Columns extracted from each pivoted sail_config row
+SAIL_ENTRY_COLUMNS = ("_time", "main", "headsail", "downwind", "staysail_mode", "comment")
+
+# Only return the columns we read, dropping _start/_stop/_measurement/tags
+_KEEP_COLUMNS = ", ".join(f'"{column}"' for column in SAIL_ENTRY_COLUMNS)
+
+# Flux for fetch_sail_data, built once; only the history limit varies per call
+_SAIL_DATA_QUERY = f'''
     from(bucket: "{INFLUX_BUCKET}")
         |> range(start: -30d)
         |> filter(fn: (r) => r["_measurement"] == "sail_config")
         |> filter(fn: (r) => r["vessel"] == "morticia")
+        |> last()
+        |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
+        |> keep(columns: [{_KEEP_COLUMNS}])
+        |> yield(name: "current")
+
+    from(bucket: "{INFLUX_BUCKET}")
+        |> range(start: -7d)
+        |> filter(fn: (r) => r["_measurement"] == "sail_config")
+        |> filter(fn: (r) => r["vessel"] == "morticia")
         |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
+        |> keep(columns: [{_KEEP_COLUMNS}])
+        |> group()
         |> sort(columns: ["_time"], desc: true)
-        |> limit(n: 1)
+        |> limit(n: {{limit}})
+        |> yield(name: "recent")
     '''
 
+
+@st.cache_data(ttl=SAIL_CACHE_TTL_SECONDS, show_spinner=False)
+def fetch_sail_data(limit: int = HISTORY_LIMIT) -> dict:
+    """
+    Query the current sail configuration and recent history from InfluxDB.
+
+    Both are fetched in a single Flux request: the newest entry from the past
+    30 days (``last()`` avoids sorting the range) and the recent entries from
+    the past 7 days, returned as separately named results.
+
+    Cached until a write or delete invalidates it (see invalidate_sail_caches),
+    or for at most SAIL_CACHE_TTL_SECONDS to pick up changes made elsewhere.
+    Errors propagate so that a failed query is never cached.
+
+    Args:
+        limit: Maximum number of history entries to return.
+
+    Returns:
+        Dictionary with "current" (main, headsail, downwind, staysail_mode, and
+        comment; defaults if no configuration found) and "recent" (list of
+        dictionaries containing time, main, headsail, downwind, staysail_mode,
+        and comment for each entry, newest first).
+    """
+    query_api = get_query_api()
+
+    current: dict[str, str | bool] = dict(DEFAULT_SAIL_CONFIG)
+    recent = []
+    query = _SAIL_DATA_QUERY.format(limit=limit)
+    # Column values are typed as object; they are the strs/bools to_line_protocol writes
+    rows: list[list[Any]] = query_api.query(query).to_values(
+        columns=["result", *SAIL_ENTRY_COLUMNS]
+    )
+    for result, entry_time, main, headsail, downwind, staysail_mode, comment in rows:
+        # Empty string fields come back from the client as None; normalize them
+        entry: dict[str, str | bool] = {
+            "main": main or "",
+            "headsail": headsail or "",
+            "downwind": downwind or "",
+            "staysail_mode": staysail_mode or False,
+            "comment": comment or "",
+        }
+        if result == "current":
+            current = {**entry, "main": main or "DOWN"}
+        else:
+            recent.append({"time": entry_time, **entry})
+
+    return {"current": current, "recent": recent}
+
+
+def get_sail_data(limit: int = HISTORY_LIMIT) -> dict:
+    """
+    Return the current sail configuration and recent history, showing an error on failure.
+
+    Args:
+        limit: Maximum number of history entries to return.
+
+    Returns:
+        Dictionary with "current" and "recent" (see fetch_sail_data). Returns
+        default values and no history on error.
+    """
     try:
-        tables = query_api.query(query)
-        for table in tables:
-            for record in table.records:
-                client.close()
-                return {
-                    "main": record.values.get("main", "DOWN"),
-                    "headsail": record.values.get("headsail", ""),
-                    "downwind": record.values.get("downwind", ""),
-                    "staysail_mode": record.values.get("staysail_mode", False),
-                    "comment": record.values.get("comment", ""),
-                }
+        return fetch_sail_data(limit)
     except Exception as e:
         st.error(f"Error reading from InfluxDB: {e}")
+        return {"current": dict(DEFAULT_SAIL_CONFIG), "recent": []}
+
+
+# Escaping for line-protocol string field values (same as influxdb_client.Point)
+_LP_STRING_ESCAPE = str.maketrans({'"': r"\"", "\\": r"\\"})
+
 
-    client.close()
-    return {"main": "DOWN", "headsail": "", "downwind": "", "staysail_mode": False, "comment": ""}
+def to_line_protocol(
+    main: str,
+    headsail: str,
+    downwind: str,
+    staysail_mode: bool,
+    comment: str,
+    timestamp: datetime,
+) -> str:
+    """
+    Serialize a sail configuration entry as an InfluxDB line-protocol record.
+
+    The schema is fixed, so the record is formatted directly rather than built
+    through influxdb_client.Point.
+
+    Args:
+        main: Main sail state.
+        headsail: Headsail selection or empty.
+        downwind: Downwind sail selection or empty.
+        staysail_mode: Whether jib is being used as staysail with Reaching Spi.
+        comment: Optional note (quotes and backslashes are escaped).
+        timestamp: Entry time, written with second precision.
+
+    Returns:
+        Line-protocol string for the ``sail_config`` measurement.
+    """
+
+    def quote(value: str) -> str:
+        return '"' + value.translate(_LP_STRING_ESCAPE) + '"'
+
+    # Every field is written, even an empty comment: a point written at the same
+    # timestamp as an existing entry merges field by field, so an omitted field
+    # would keep the old entry's value
+    return (
+        f"sail_config,vessel=morticia "
+        f"main={quote(main)},headsail={quote(headsail)},downwind={quote(downwind)},"
+        f"staysail_mode={'true' if staysail_mode else 'false'},comment={quote(comment)} "
+        f"{int(timestamp.timestamp())}"
+    )
 
 
 def write_sail_config(
@@ -238,79 +657,45 @@ def write_sail_config(
         timestamp: Optional backdated timestamp. Uses current UTC time if None.
 
     Returns:
-        True if write succeeded, False otherwise.
+        True if the write succeeded or is still pending in the background,
+        False if it failed.
     """
-    client = get_influx_client()
-    write_api = client.write_api(write_options=SYNCHRONOUS)
+    write_api = get_write_api()
+    tracker = get_write_tracker()
 
     if timestamp is None:
         timestamp = datetime.now(timezone.utc)
 
-    point = (
-        Point("sail_config")
-        .tag("vessel", "morticia")
-        .field("main", main)
-        .field("headsail", headsail)
-        .field("downwind", downwind)
-        .field("staysail_mode", staysail_mode)
-        .field("comment", comment)
-        .time(timestamp, WritePrecision.S)
-    )
+    record = to_line_protocol(main, headsail, downwind, staysail_mode, comment, timestamp)
 
+    # Track before queueing: the background writer may confirm before write() returns
+    pending = tracker.track(record)
     try:
-        write_api.write(bucket=INFLUX_BUCKET, record=point)
-        client.close()
-        return True
+        write_api.write(
+            bucket=INFLUX_BUCKET,
+            record=record,
+            # The client annotates WritePrecision, but its members are plain strs
+            write_precision=WritePrecision.S,  # type: ignore[arg-type]
+        )
     except Exception as e:
+        tracker.discard(record, pending)
         st.error(f"Error writing to InfluxDB: {e}")
-        client.close()
         return False
 
-
-@st.cache_data(ttl=30)
-def get_recent_entries(limit: int = 10) -> list[dict]:
-    """
-    Fetch recent sail log entries from the past 7 days.
-    Cached for 60 seconds to reduce database queries.
-
-    Args:
-        limit: Maximum number of entries to return.
-
-    Returns:
-        List of dictionaries containing time, main, headsail, downwind,
-        staysail_mode, and comment for each entry.
-    """
-    client = get_influx_client()
-    query_api = client.query_api()
-
-    query = f'''
-    from(bucket: "{INFLUX_BUCKET}")
-        |> range(start: -7d)
-        |> filter(fn: (r) => r["_measurement"] == "sail_config")
-        |> filter(fn: (r) => r["vessel"] == "morticia")
-        |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
-        |> sort(columns: ["_time"], desc: true)
-        |> limit(n: {limit})
-    '''
-
-    entries = []
-    try:
-        tables = query_api.query(query)
-        for table in tables:
-            for record in table.records:
-                entries.append({
-                    "time": record.get_time(),
-                    "main": record.values.get("main", ""),
-                    "headsail": record.values.get("headsail", ""),
-                    "downwind": record.values.get("downwind", ""),
-                    "staysail_mode": record.values.get("staysail_mode", False),
-                    "comment": record.values.get("comment", ""),
-                })
-    except Exception as e:
-        st.error(f"Error reading history: {e}")
-
-    client.close()
-    return entries
+    # Wait for the background writer so the rerun reads back our own write
+    if not pending.wait():
+        # Still being retried; it may yet land, so don't invite a duplicate save
+        st.warning(
+            "Save not confirmed yet - InfluxDB is slow to respond and the write is "
+            "still being retried. Check the history before saving again."
+        )
+    elif pending.error:
+        st.error(f"Error writing to InfluxDB: {pending.error}")
+        return False
+    else:
+        st.toast("Saved!", icon="✅")
+    invalidate_sail_caches()
+    return True
 
 
 def delete_sail_entry(timestamp: datetime) -> bool:
@@ -323,12 +708,12 @@ def delete_sail_entry(timestamp: datetime) -> bool:
     Returns:
         True if delete succeeded, False otherwise.
     """
-    client = get_influx_client()
-    delete_api = client.delete_api()
+    delete_api = get_delete_api()
 
-    # Delete requires a time range - use 1 second window around the exact timestamp
-    start = timestamp - timedelta(milliseconds=500)
-    stop = timestamp + timedelta(milliseconds=500)
+    # Entries are stored at whole seconds and the delete range is inclusive at
+    # both ends, so cover just this entry's second without reaching the next one
+    start = timestamp
+    stop = timestamp + timedelta(microseconds=999_999)
 
     try:
         delete_api.delete(
@@ -338,12 +723,22 @@ def delete_sail_entry(timestamp: datetime) -> bool:
             bucket=INFLUX_BUCKET,
             org=INFLUX_ORG,
         )
-        client.close()
-        return True
     except Exception as e:
         st.error(f"Error deleting entry: {e}")
-        client.close()
         return False
+    invalidate_sail_caches()
+    return True
+
+
+def invalidate_sail_caches() -> None:
+    """
+    Clear cached sail data after the log has changed.
+
+    Writes and deletes made through this app clear the caches immediately rather
+    than waiting for the TTL. Caches are shared across sessions, so other users
+    see the change on their next rerun.
+    """
+    fetch_sail_data.clear()
 
 
 # Page configuration
@@ -354,294 +749,28 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
-# Compact mobile-first CSS
-st.markdown("""
-<style>
-    /* Hide Streamlit chrome but keep sidebar toggle */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    /* Keep header visible for sidebar hamburger menu */
-    header[data-testid="stHeader"] {
-        background: transparent !important;
-        height: auto !important;
-    }
-
-    /* Compact container with bottom padding for iOS dock */
-    .main .block-container {
-        padding: 0.5rem 0.5rem 5rem 0.5rem;
-        max-width: 100%;
-    }
-
-    /* Remove default streamlit spacing */
-    .stVerticalBlock > div {
-        gap: 0.25rem;
-    }
-
-    /* Prevent horizontal scroll on entire page */
-    .main, .main .block-container, [data-testid="stAppViewContainer"] {
-        max-width: 100vw !important;
-        overflow-x: hidden !important;
-    }
-
-    /* Style pills for touch-friendly mobile use */
-    [data-testid="stPills"] {
-        gap: 15px !important;
-    }
-    [data-testid="stPills"] button {
-        min-height: 102px !important;
-        padding: 1.2rem 2.1rem !important;
-        font-size: 2.6rem !important;
-        font-weight: bold !important;
-        border-radius: 18px !important;
-        touch-action: manipulation;
-    }
-    /* Pills container should wrap on mobile */
-    [data-testid="stPills"] > div {
-        flex-wrap: wrap !important;
-        justify-content: center !important;
-        gap: 15px !important;
-    }
-
-    /* Bottom bar columns - keep side by side */
-    [data-testid="stHorizontalBlock"] {
-        flex-wrap: nowrap !important;
-        gap: 8px !important;
-    }
-    [data-testid="column"] {
-        min-width: 0 !important;
-    }
-
-    /* Sticky header container - positioned below Streamlit header */
-    .sticky-header {
-        position: sticky;
-        top: 0;
-        z-index: 99;
-        background: transparent;
-        padding: 0.25rem 0;
-        margin-bottom: 0.25rem;
-    }
-
-    /* Compact header */
-    .compact-header {
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        padding: 0.4rem 0.75rem;
-        background: #1a1a2e;
-        color: white;
-        border-radius: 10px;
-        margin-bottom: 0.4rem;
-    }
-    .compact-header .title {
-        font-size: 1.4rem;
-        font-weight: bold;
-    }
-    .compact-header .time {
-        font-size: 1.2rem;
-        color: #ccc;
-    }
-
-    /* Current state banner */
-    .state-banner {
-        font-size: 1.3rem;
-        font-weight: bold;
-        text-align: center;
-        padding: 0.6rem;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border-radius: 10px;
-        margin-bottom: 0.4rem;
-    }
-
-    /* Section labels */
-    .section-label {
-        font-size: 1.65rem;
-        font-weight: bold;
-        color: #666;
-        margin: 0.7rem 0 0.35rem 0;
-        text-transform: uppercase;
-        letter-spacing: 0.05em;
-    }
-
-    /* Touch-friendly buttons */
-    .stButton > button {
-        width: 100%;
-        min-height: 56px;
-        font-size: 1.2rem;
-        font-weight: bold;
-        border-radius: 10px;
-        touch-action: manipulation;
-    }
-
-    /* Primary button (UPDATE) - green */
-    .stButton > button[kind="primary"] {
-        background-color: #28a745 !important;
-        color: white !important;
-        border: 2px solid #1e7e34 !important;
-    }
-
-    /* Popover trigger button styling */
-    .stPopover > div > button {
-        min-height: 52px !important;
-        font-size: 1.1rem !important;
-        font-weight: bold !important;
-        border-radius: 10px !important;
-    }
-
-    /* Checkboxes - compact */
-    .stCheckbox {
-        padding: 0 !important;
-    }
-    .stCheckbox label {
-        font-size: 0.85rem !important;
-    }
-
-    /* Date/time inputs - compact */
-    .stDateInput, .stTimeInput {
-        margin-bottom: 0.25rem !important;
-    }
-    .stDateInput input, .stTimeInput input {
-        padding: 0.4rem !important;
-        font-size: 0.95rem !important;
-    }
-
-    /* Pending changes indicator */
-    .pending-indicator {
-        background-color: #fff3cd;
-        color: #856404;
-        padding: 0.2rem 0.5rem;
-        border-radius: 4px;
-        font-size: 0.8rem;
-        text-align: center;
-    }
-
-    /* Sidebar styling - compact history with scroll */
-    [data-testid="stSidebar"] > div:first-child {
-        overflow-y: auto !important;
-        max-height: 100vh !important;
-    }
-    .sidebar .sidebar-content {
-        padding: 0.5rem;
-    }
-    [data-testid="stSidebar"] [data-testid="stHorizontalBlock"] {
-        gap: 2px !important;
-        flex-wrap: nowrap !important;
-        align-items: center !important;
-        margin-bottom: 0.15rem;
-    }
-    [data-testid="stSidebar"] [data-testid="column"] {
-        padding: 0 !important;
-    }
-    [data-testid="stSidebar"] .stButton > button {
-        min-height: 28px !important;
-        min-width: 28px !important;
-        padding: 0.1rem 0.4rem !important;
-        font-size: 0.85rem !important;
-    }
-    [data-testid="stSidebar"] small {
-        line-height: 1.2;
-        display: block;
-    }
-    /* History row styling */
-    .history-row {
-        padding: 4px 6px;
-        border-radius: 4px;
-    }
-
-    /* Popover styling - position higher for mobile keyboard */
-    .stPopover {
-        width: 100%;
-    }
-    .stPopover > div > button {
-        width: 100%;
-    }
-    [data-testid="stPopover"] > div > div {
-        top: 10vh !important;
-        bottom: auto !important;
-        max-height: 40vh !important;
-    }
-    [data-testid="stPopover"] textarea {
-        font-size: 16px !important; /* Prevents iOS zoom on focus */
-    }
-
-    /* Ensure border-box sizing */
-    *, *::before, *::after {
-        box-sizing: border-box;
-    }
-
-    /* Mobile optimizations - keep things readable */
-    @media (max-width: 500px) {
-        .main .block-container {
-            padding: 0.4rem 0.4rem 5rem 0.4rem;
-        }
-        .state-banner {
-            font-size: 1.15rem;
-            padding: 0.5rem;
-        }
-        .compact-header .title {
-            font-size: 1.25rem;
-        }
-        .compact-header .time {
-            font-size: 1.1rem;
-        }
-        .section-label {
-            font-size: 1.5rem;
-            margin: 0.6rem 0 0.3rem 0;
-        }
-        /* Pills stay readable on mobile */
-        [data-testid="stPills"] button {
-            min-height: 93px !important;
-            padding: 1rem 1.6rem !important;
-            font-size: 2.4rem !important;
-        }
-        /* Stack status banner and UPDATE button on narrow screens */
-        [data-testid="stHorizontalBlock"]:first-of-type {
-            flex-wrap: wrap !important;
-        }
-        [data-testid="stHorizontalBlock"]:first-of-type > [data-testid="stColumn"] {
-            width: 100% !important;
-            flex: 1 1 100% !important;
-        }
-    }
+# Compact mobile-first CSS, served from static/styles.css (see .streamlit/config.toml)
+# so the browser caches it instead of receiving the stylesheet on every rerun
+st.markdown('<link rel="stylesheet" href="app/static/styles.css">', unsafe_allow_html=True)
 
-    /* Dark mode adjustments */
-    @media (prefers-color-scheme: dark) {
-        .pending-indicator {
-            background-color: #5c4d00;
-            color: #ffd700;
-        }
-        .history-row {
-            color: #e0e0e0 !important;
-        }
-        .history-row small, .history-row b, .history-row i {
-            color: #e0e0e0 !important;
-        }
-    }
-
-    /* Streamlit dark theme detection */
-    [data-testid="stAppViewContainer"][data-theme="dark"] .pending-indicator,
-    .stApp[data-theme="dark"] .pending-indicator {
-        background-color: #5c4d00;
-        color: #ffd700;
-    }
-    [data-testid="stSidebar"][data-theme="dark"] .history-row,
-    [data-testid="stSidebar"] .history-row small,
-    [data-testid="stSidebar"] .history-row b {
-        color: inherit !important;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# Get timezone and calculate offset for JavaScript
 boat_tz = get_boat_timezone()
-now_utc = datetime.now(timezone.utc)
-current_time = format_local_time(now_utc, boat_tz)
-# Calculate timezone offset in minutes for JavaScript
-tz_offset_seconds = now_utc.astimezone(boat_tz).utcoffset().total_seconds()
-tz_offset_minutes = int(tz_offset_seconds // 60)
 
 # Always fetch current committed state from InfluxDB (ensures multi-user consistency)
-committed_config = get_current_sail_config()
+sail_data = get_sail_data()
+committed_config = sail_data["current"]
+
+# The history fragment renders from this copy; it only re-queries on its own
+# reruns after a delete (a full run like this one has just fetched)
+st.session_state.history_entries = sail_data["recent"]
+st.session_state.pop("history_needs_reload", None)
+
+# Committed (main, headsail, downwind, staysail_mode), in format_config_summary order
+committed_selection = (
+    committed_config["main"],
+    committed_config["headsail"],
+    committed_config["downwind"],
+    committed_config["staysail_mode"],
+)
 
 # Initialize or sync session state with committed state
 if "has_pending_changes" not in st.session_state:
@@ -656,18 +785,23 @@ if not st.session_state.has_pending_changes:
     st.session_state.headsail = committed_config["headsail"]
     st.session_state.downwind = committed_config["downwind"]
     st.session_state.staysail_mode = committed_config["staysail_mode"]
+    # Pills take their selection from these keys (they have no default=)
+    st.session_state.main_pills = committed_config["main"]
+    st.session_state.headsail_pills = committed_config["headsail"] or None
+    st.session_state.downwind_pills = committed_config["downwind"] or None
     # Clear comment - notes are per-entry, not carried forward
     st.session_state.pending_comment = ""
 
 
-def has_changes() -> bool:
-    """Check if current selections differ from committed state."""
-    return (
-        st.session_state.main != committed_config["main"]
-        or st.session_state.headsail != committed_config["headsail"]
-        or st.session_state.downwind != committed_config["downwind"]
-        or st.session_state.staysail_mode != committed_config["staysail_mode"]
-    )
+def current_selection() -> tuple[str, str, str, bool]:
+    """Return the selected (main, headsail, downwind, staysail_mode)."""
+    ss = st.session_state
+    return (ss.main, ss.headsail, ss.downwind, ss.staysail_mode)
+
+
+def has_changes(selection: tuple[str, str, str, bool]) -> bool:
+    """Check if a selection from current_selection() differs from committed state."""
+    return selection != committed_selection
 
 
 def mark_pending():
@@ -679,7 +813,7 @@ def clear_pending():
     """Clear pending changes flag after successful save."""
     st.session_state.has_pending_changes = False
     # Note: pending_comment is cleared by the sync logic at page start
-    # when has_pending_changes is False (can't modify widget key after render)
+    # when has_pending_changes is False
 
 
 def format_config_summary(main: str, headsail: str, downwind: str, staysail_mode: bool) -> str:
@@ -694,14 +828,14 @@ def format_config_summary(main: str, headsail: str, downwind: str, staysail_mode
 
     # Headsail
     if headsail:
-        sail_name = SAIL_DISPLAY.get(headsail, headsail)
+        sail_name = SAIL_DISPLAY[headsail]
         if staysail_mode:
             sail_name += " (S)"
         parts.append(sail_name)
 
     # Downwind
     if downwind:
-        parts.append(SAIL_DISPLAY.get(downwind, downwind))
+        parts.append(SAIL_DISPLAY[downwind])
 
     if not headsail and not downwind and main == "DOWN":
         return "All sails down"
@@ -710,187 +844,267 @@ def format_config_summary(main: str, headsail: str, downwind: str, staysail_mode
 
 
 # ============ SIDEBAR (History) ============
-with st.sidebar:
-    st.markdown("### History")
+def confirm_delete(entry_time: datetime, is_latest: bool) -> None:
+    """Delete the selected history entry and reset the delete picker."""
+    if delete_sail_entry(entry_time):
+        st.session_state.delete_entry = None
+        if is_latest:
+            # Deleting the newest entry changes the current config in the main area
+            st.session_state.delete_needs_full_rerun = True
+        else:
+            st.session_state.history_needs_reload = True
+
 
-    if "pending_delete" not in st.session_state:
-        st.session_state.pending_delete = None
+def cancel_delete() -> None:
+    """Reset the delete picker without deleting anything."""
+    st.session_state.delete_entry = None
+
+
+@st.fragment
+def history_sidebar() -> None:
+    """
+    Render the history list and delete picker.
 
-    entries = get_recent_entries(50)
+    Runs as a fragment so deleting an older entry only rebuilds the sidebar.
+    Entries come from the page-level fetch via session state, so a full run
+    queries InfluxDB once; only the fragment rerun after a delete re-reads them.
+    """
+    if st.session_state.pop("delete_needs_full_rerun", False):
+        st.rerun()
+
+    st.markdown("### History")
+
+    if st.session_state.pop("history_needs_reload", False):
+        st.session_state.history_entries = get_sail_data()["recent"]
+    entries = st.session_state.history_entries
     if entries:
+        # Render all rows as one markdown block; only the delete picker is a widget
+        rows = []
+        entry_labels = {}
+        entry_times = {}
         for i, entry in enumerate(entries):
             time_str = format_local_datetime(entry["time"], boat_tz)
             parts = []
             if entry["main"]:
                 parts.append(f"M:{entry['main']}")
             if entry["headsail"]:
-                h = SAIL_DISPLAY.get(entry["headsail"], entry["headsail"])
+                h = SAIL_DISPLAY[entry["headsail"]]
                 if entry["staysail_mode"]:
                     h += "(S)"
                 parts.append(h)
             if entry["downwind"]:
-                parts.append(SAIL_DISPLAY.get(entry["downwind"], entry["downwind"]))
+                parts.append(SAIL_DISPLAY[entry["downwind"]])
 
             config = " + ".join(parts) if parts else "All down"
             entry_key = entry["time"].isoformat()
-            is_pending = st.session_state.pending_delete == entry_key
+            entry_labels[entry_key] = f"{time_str} · {config}"
+            entry_times[entry_key] = entry["time"]
 
             # Alternate row shading (semi-transparent for dark mode compatibility)
             bg_color = "rgba(128,128,128,0.3)" if i % 2 == 0 else "rgba(128,128,128,0.1)"
-
-            if is_pending:
-                # Compact confirmation row
-                st.markdown(f'<div style="background:{bg_color};padding:4px;border-radius:4px;">', unsafe_allow_html=True)
-                cols = st.columns([3, 1, 1])
-                with cols[0]:
-                    st.markdown("<small>Delete?</small>", unsafe_allow_html=True)
-                with cols[1]:
-                    if st.button("✓", key=f"confirm_{i}", help="Confirm delete"):
-                        if delete_sail_entry(entry["time"]):
-                            st.session_state.pending_delete = None
-                            get_recent_entries.clear()
-                            get_current_sail_config.clear()
-                            st.rerun()
-                with cols[2]:
-                    if st.button("✗", key=f"cancel_{i}", help="Cancel"):
-                        st.session_state.pending_delete = None
-                        st.rerun()
-                st.markdown("</div>", unsafe_allow_html=True)
-            else:
-                # Compact entry row with inline delete
-                comment_text = f' <i>"{entry["comment"]}"</i>' if entry["comment"] else ""
-                cols = st.columns([5, 1])
-                with cols[0]:
-                    st.markdown(
-                        f'<div class="history-row" style="background:{bg_color};">'
-                        f'<small><b>{time_str}</b><br/>{config}{comment_text}</small>'
-                        f'</div>',
-                        unsafe_allow_html=True
-                    )
-                with cols[1]:
-                    if st.button("🗑", key=f"delete_{i}", help="Delete entry"):
-                        st.session_state.pending_delete = entry_key
-                        st.rerun()
+            comment_text = f' <i>"{entry["comment"]}"</i>' if entry["comment"] else ""
+            rows.append(
+                f'<div class="history-row" style="background:{bg_color};">'
+                f"<small><b>{time_str}</b><br/>{config}{comment_text}</small>"
+                f"</div>"
+            )
+        st.markdown("".join(rows), unsafe_allow_html=True)
+        entry_key_latest = next(iter(entry_times))
+
+        # Single delete picker instead of one trash button per row
+        selected_key = st.selectbox(
+            "Delete entry",
+            options=list(entry_labels),
+            index=None,
+            format_func=entry_labels.__getitem__,
+            placeholder="🗑 Delete an entry...",
+            key="delete_entry",
+            label_visibility="collapsed",
+        )
+        if selected_key is not None:
+            cols = st.columns([3, 1, 1])
+            with cols[0]:
+                st.markdown("<small>Delete?</small>", unsafe_allow_html=True)
+            with cols[1]:
+                st.button(
+                    "✓",
+                    key="confirm_delete",
+                    help="Confirm delete",
+                    on_click=confirm_delete,
+                    args=(entry_times[selected_key], selected_key == entry_key_latest),
+                )
+            with cols[2]:
+                st.button("✗", key="cancel_delete", help="Cancel", on_click=cancel_delete)
     else:
         st.markdown("*No recent entries*")
 
 
+with st.sidebar:
+    history_sidebar()
+
+
 # ============ MAIN CONTENT ============
 
-# Build pending indicator HTML if needed
-pending_html = ""
-if has_changes():
-    pending_html = '<div class="pending-indicator">Unsaved changes</div>'
-
-# Current state summary
-config_summary = format_config_summary(
-    st.session_state.main,
-    st.session_state.headsail,
-    st.session_state.downwind,
-    st.session_state.staysail_mode,
-)
 
-# Sticky header containing: title/time and pending indicator
-st.markdown(f'''
-<div class="sticky-header">
-    <div class="compact-header">
-        <span class="title">{BOAT_NAME.upper()}</span>
-        <span class="time" id="header-clock">{current_time}</span>
-    </div>
-    {pending_html}
+# Title/time header, re-run on its own to keep the clock current
+@st.fragment(run_every="30s")
+def header_clock() -> None:
+    """Render the header, re-running on its own every 30s to keep the clock current."""
+    tz = get_boat_timezone()
+    current_time = format_local_time(datetime.now(tz), tz)
+    st.markdown(
+        f"""
+<div class="compact-header">
+    <span class="title">{BOAT_NAME.upper()}</span>
+    <span class="time">{current_time}</span>
 </div>
-<script>
-    function updateClock() {{
-        const now = new Date();
-        // Convert to boat timezone using offset from server
-        const boatOffsetMs = {tz_offset_minutes} * 60 * 1000;
-        const utcMs = now.getTime() + (now.getTimezoneOffset() * 60 * 1000);
-        const boatTime = new Date(utcMs + boatOffsetMs);
-        const hours = String(boatTime.getHours()).padStart(2, '0');
-        const minutes = String(boatTime.getMinutes()).padStart(2, '0');
-        const clockEl = document.getElementById('header-clock');
-        if (clockEl) clockEl.textContent = hours + ':' + minutes;
-    }}
-    updateClock();
-    setInterval(updateClock, 30000);
-</script>
-''', unsafe_allow_html=True)
+""",
+        unsafe_allow_html=True,
+    )
+
+
+# Sticky header containing title/time and the pending indicator. The indicator
+# (like the state banner) is filled in by sail_selector so pill taps can update
+# it with a fragment-only rerun; the container's key gives it the
+# st-key-sticky_header class that static/styles.css pins to the top
+with st.container(key="sticky_header"):
+    header_clock()
+    pending_slot = st.empty()
+
+
+def save_sail_config() -> None:
+    """
+    Save the selected configuration when UPDATE is clicked.
+
+    Runs as the button's on_click callback, before the rerun the click
+    triggers, so that rerun already syncs from the saved entry (and clears the
+    note) without a second st.rerun().
+    """
+    success = write_sail_config(
+        main=st.session_state.main,
+        headsail=st.session_state.headsail,
+        downwind=st.session_state.downwind,
+        staysail_mode=st.session_state.staysail_mode,
+        comment=st.session_state.pending_comment,
+        timestamp=st.session_state.get("backdate_time"),
+    )
+    if success:
+        clear_pending()
+    else:
+        st.error("Failed to save")
+
 
 # State banner and UPDATE button side by side (50/50 split)
 col_status, col_update = st.columns([1, 1], gap="small")
 with col_status:
-    st.markdown(f'<div class="state-banner">{config_summary}</div>', unsafe_allow_html=True)
+    banner_slot = st.empty()
 with col_update:
-    update_clicked = st.button("UPDATE", key="update", use_container_width=True, type="primary")
+    st.button(
+        "UPDATE",
+        key="update",
+        on_click=save_sail_config,
+        use_container_width=True,
+        type="primary",
+    )
+
 
 # ============ SAIL SELECTION (Fragment for fast updates) ============
-@st.fragment
-def sail_selector():
-    """Fragment for sail selection - enables partial reruns for faster response."""
-    # Main sail
-    st.markdown('<div class="section-label">MAIN</div>', unsafe_allow_html=True)
-    main_options = {opt: SAIL_DISPLAY.get(opt, opt) for opt in MAIN_STATES}
-    main_selection = st.pills(
-        "Main sail",
-        options=list(main_options.keys()),
-        format_func=lambda x: main_options[x],
-        default=st.session_state.main,
-        key="main_pills",
-        label_visibility="collapsed",
-    )
-    if main_selection and main_selection != st.session_state.main:
-        st.session_state.main = main_selection
-        mark_pending()
+# Selection changes are applied in on_change callbacks, which run before the
+# fragment rerun that the tap triggers, so the rerun renders the final state
+def on_main_change() -> None:
+    """Apply a main sail pill tap."""
+    selection = st.session_state.main_pills
+    if selection is None:
+        # The main always has a state; tapping the selected pill keeps it
+        st.session_state.main_pills = st.session_state.main
+        return
+    st.session_state.main = selection
+    mark_pending()
+
+
+def on_headsail_change() -> None:
+    """Apply a headsail pill tap (tapping the selected pill clears it)."""
+    headsail = st.session_state.headsail_pills or ""
+    st.session_state.headsail = headsail
+    if headsail != "JIB" or st.session_state.downwind != "REACHING_SPI":
+        st.session_state.staysail_mode = False
+    mark_pending()
+
+
+def on_downwind_change() -> None:
+    """Apply a downwind pill tap; only the jib can be flown with the reaching spinnaker."""
+    downwind = st.session_state.downwind_pills or ""
+    st.session_state.downwind = downwind
+    if downwind != "REACHING_SPI" or st.session_state.headsail not in ("JIB", ""):
+        st.session_state.headsail = ""
+        st.session_state.headsail_pills = None
+        st.session_state.staysail_mode = False
+    mark_pending()
+
+
+def on_staysail_change() -> None:
+    """Apply a staysail checkbox toggle."""
+    st.session_state.staysail_mode = st.session_state.staysail_check
+    mark_pending()
+
+
+def sail_pills(
+    section: str, labels: dict[str, str], key: str, on_change: Callable[[], None]
+) -> None:
+    """
+    Render one section label and its single-select sail pills.
 
-    # Headsail
-    st.markdown('<div class="section-label">HEADSAIL</div>', unsafe_allow_html=True)
-    headsail_options = {sail: SAIL_DISPLAY.get(sail, sail) for sail in HEADSAILS}
-    headsail_selection = st.pills(
-        "Headsail",
-        options=list(headsail_options.keys()),
-        format_func=lambda x: headsail_options[x],
-        default=st.session_state.headsail if st.session_state.headsail else None,
-        key="headsail_pills",
+    Args:
+        section: Section heading shown above the pills.
+        labels: Option -> display name for the section's sails.
+        key: Widget key holding the selected option.
+        on_change: Callback applying the new selection.
+    """
+    st.markdown(f'<div class="section-label">{section}</div>', unsafe_allow_html=True)
+    st.pills(
+        section.title(),
+        options=list(labels),
+        format_func=labels.__getitem__,
+        key=key,
+        on_change=on_change,
         label_visibility="collapsed",
     )
-    new_headsail = headsail_selection if headsail_selection else ""
-    if new_headsail != st.session_state.headsail:
-        st.session_state.headsail = new_headsail
-        if new_headsail != "JIB" or st.session_state.downwind != "REACHING_SPI":
-            st.session_state.staysail_mode = False
-        mark_pending()
 
-    # Downwind
-    st.markdown('<div class="section-label">DOWNWIND</div>', unsafe_allow_html=True)
-    downwind_options = {sail: SAIL_DISPLAY.get(sail, sail) for sail in DOWNWIND_SAILS}
-    downwind_selection = st.pills(
-        "Downwind",
-        options=list(downwind_options.keys()),
-        format_func=lambda x: downwind_options[x],
-        default=st.session_state.downwind if st.session_state.downwind else None,
-        key="downwind_pills",
-        label_visibility="collapsed",
-    )
-    new_downwind = downwind_selection if downwind_selection else ""
-    if new_downwind != st.session_state.downwind:
-        st.session_state.downwind = new_downwind
-        if new_downwind != "REACHING_SPI":
-            st.session_state.headsail = ""
-            st.session_state.staysail_mode = False
-        elif st.session_state.headsail not in ["JIB", ""]:
-            st.session_state.headsail = ""
-        mark_pending()
+
+@st.fragment
+def sail_selector():
+    """Fragment for sail selection - enables partial reruns for faster response."""
+    sail_pills("MAIN", MAIN_LABELS, key="main_pills", on_change=on_main_change)
+    sail_pills("HEADSAIL", HEADSAIL_LABELS, key="headsail_pills", on_change=on_headsail_change)
+    sail_pills("DOWNWIND", DOWNWIND_LABELS, key="downwind_pills", on_change=on_downwind_change)
 
     # Staysail toggle
     if st.session_state.headsail == "JIB" and st.session_state.downwind == "REACHING_SPI":
-        staysail = st.checkbox(
+        st.checkbox(
             "Jib as Staysail",
             value=st.session_state.staysail_mode,
-            key="staysail_check"
+            key="staysail_check",
+            on_change=on_staysail_change,
+        )
+
+    render_status()
+
+
+def render_status():
+    """Render the pending indicator and current state banner into their placeholders."""
+    selection = current_selection()
+    if has_changes(selection):
+        pending_slot.markdown(
+            '<div class="pending-indicator">Unsaved changes</div>', unsafe_allow_html=True
         )
-        if staysail != st.session_state.staysail_mode:
-            st.session_state.staysail_mode = staysail
-            mark_pending()
+    else:
+        pending_slot.empty()
+
+    config_summary = format_config_summary(*selection)
+    banner_slot.markdown(
+        f'<div class="state-banner">{config_summary}</div>', unsafe_allow_html=True
+    )
+
 
 # Render the sail selector fragment
 sail_selector()
@@ -906,53 +1120,39 @@ with st.popover(popover_label, use_container_width=True):
         key="pending_comment",
         height=60,
         placeholder="Conditions, reason for change...",
-        label_visibility="collapsed"
+        label_visibility="collapsed",
     )
 
 # Backdate toggle (collapsible)
 use_backdate = st.checkbox("Backdate entry", key="use_backdate")
 if use_backdate:
-    local_now = datetime.now(timezone.utc).astimezone(boat_tz)
-    tz_abbrev = local_now.strftime("%Z")
-    entry_date = st.date_input("Date", value=local_now.date(), key="entry_date", label_visibility="collapsed")
+    local_now = datetime.now(boat_tz)
+    entry_date = st.date_input(
+        "Date", value=local_now.date(), key="entry_date", label_visibility="collapsed"
+    )
     # Hour and minute dropdowns on separate lines (5-min granularity)
     current_hour = local_now.hour
     current_min = (local_now.minute // 5) * 5  # Round to nearest 5
     hours = list(range(24))
     minutes = list(range(0, 60, 5))
-    sel_hour = st.selectbox("Hour", hours, index=current_hour, key="entry_hour", format_func=lambda x: f"{x:02d}h")
-    sel_min = st.selectbox("Minute", minutes, index=minutes.index(current_min), key="entry_min", format_func=lambda x: f"{x:02d}m")
+    sel_hour = st.selectbox(
+        "Hour", hours, index=current_hour, key="entry_hour", format_func=lambda x: f"{x:02d}h"
+    )
+    sel_min = st.selectbox(
+        "Minute",
+        minutes,
+        index=minutes.index(current_min),
+        key="entry_min",
+        format_func=lambda x: f"{x:02d}m",
+    )
     entry_time = dt_time(sel_hour, sel_min)
     local_dt = datetime.combine(entry_date, entry_time).replace(tzinfo=boat_tz)
     st.session_state.backdate_time = local_dt.astimezone(timezone.utc)
 else:
     st.session_state.backdate_time = None
 
-# Handle UPDATE button click (button is at top of page)
-if update_clicked:
-    # Get backdate time if set
-    timestamp = st.session_state.get("backdate_time")
-
-    success = write_sail_config(
-        main=st.session_state.main,
-        headsail=st.session_state.headsail,
-        downwind=st.session_state.downwind,
-        staysail_mode=st.session_state.staysail_mode,
-        comment=st.session_state.pending_comment,
-        timestamp=timestamp
-    )
-    if success:
-        clear_pending()
-        # Clear caches so new data appears
-        get_current_sail_config.clear()
-        get_recent_entries.clear()
-        st.toast("Saved!", icon="✅")
-        st.rerun()
-    else:
-        st.error("Failed to save")
-
 # Version footer
 st.markdown(
     f'<div style="text-align:center;color:#999;font-size:0.75rem;margin-top:1rem;">v{__version__}</div>',
-    unsafe_allow_html=True
+    unsafe_allow_html=True,
 )